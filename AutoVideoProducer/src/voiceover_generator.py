@@ -5,13 +5,27 @@ Generates voiceovers using gTTS with tone mimic capabilities and fallback option
 """
 
 import os
+import re
+import copy
+import math
 import json
+import base64
+import shutil
+import asyncio
+import hashlib
+import threading
+import wave
 import logging
-from typing import List, Dict, Optional
+import functools
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Optional, Callable
 from datetime import datetime
 import subprocess
 import tempfile
 import time
+import uuid
 
 # Try to import optional dependencies
 try:
@@ -36,6 +50,102 @@ except ImportError:
     PYDUB_AVAILABLE = False
     logging.warning("pydub not available for audio processing")
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logging.warning("numpy not available, fallback audio disabled")
+
+try:
+    import lameenc
+    LAMEENC_AVAILABLE = True
+except ImportError:
+    LAMEENC_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import aiofiles
+    import aiofiles.os
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    AIOFILES_AVAILABLE = False
+
+try:
+    from mutagen import File as MutagenFile
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    logging.warning("aiohttp not available, gTTS requests will run in worker threads")
+
+# Maximum number of voiceovers synthesized at the same time
+MAX_CONCURRENT_TTS = 8
+
+# Maximum number of gTTS chunk requests in flight across all voiceovers, matches the connection pool size
+MAX_CONCURRENT_TTS_REQUESTS = 16
+
+# Average speaking rate used to estimate durations (~150 words per minute)
+SECONDS_PER_CHAR = 1 / 15.0
+
+# Audio payload inside a Google Translate batchexecute response (same pattern gTTS uses)
+GTTS_AUDIO_PATTERN = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+def _decode_gtts_response(body: str) -> bytes:
+    """Extract the MP3 bytes from a batchexecute response body"""
+    audio = bytearray()
+    for line in body.splitlines():
+        if "jQ1olc" in line:
+            match = GTTS_AUDIO_PATTERN.search(line)
+            if not match:
+                raise Exception("gTTS response did not contain audio data")
+            audio.extend(base64.b64decode(match.group(1).encode("ascii")))
+    return bytes(audio)
+
+def _dumps(obj) -> bytes:
+    """Serialize to indented UTF-8 JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+@functools.lru_cache(maxsize=16)
+def _load_config_cached(config_path: str, mtime: float) -> Dict:
+    """Parse a config file once per modification time; the result is shared, callers copy it"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Enhanced script template used when a script has no usable content; None marks where the title is spoken
+ENHANCED_SCRIPT_TEMPLATE = (
+    "\nWelcome to our channel! Today we're exploring ",
+    None,
+    """.
+
+This is a fascinating topic that will change your perspective completely. 
+What you're about to learn will surprise you and make you think differently.
+
+The key insights we'll cover today are absolutely crucial for understanding this subject.
+You won't want to miss what comes next.
+
+Stay tuned as we dive deep into the most important aspects of """,
+    None,
+    """.
+This information could be life-changing for you.
+
+Remember to like, subscribe, and share this video with others who might benefit.
+Thank you for watching, and we'll see you in the next video!
+"""
+)
+
 class VoiceoverSettings:
     """Settings for voiceover generation"""
     def __init__(self):
@@ -49,19 +159,25 @@ class VoiceoverSettings:
         self.enhance_psychological_impact = True
 
 class VoiceoverGenerator:
+    # Speech parameters per tone, shared read-only by all instances
+    TONE_PRESETS = MappingProxyType({
+        'excited': MappingProxyType({'rate': 1.2, 'pitch': 1.1, 'volume': 1.2}),
+        'calm': MappingProxyType({'rate': 0.9, 'pitch': 0.95, 'volume': 0.9}),
+        'authoritative': MappingProxyType({'rate': 1.0, 'pitch': 1.05, 'volume': 1.1}),
+        'friendly': MappingProxyType({'rate': 1.1, 'pitch': 1.0, 'volume': 1.0}),
+        'dramatic': MappingProxyType({'rate': 0.95, 'pitch': 1.15, 'volume': 1.3}),
+        'manipulative': MappingProxyType({'rate': 1.05, 'pitch': 1.08, 'volume': 1.15})  # For psychological manipulation
+    })
+    
     def __init__(self, config_path: str = "config/config.json"):
         """Initialize the voiceover generator with configuration"""
         self.config_path = config_path
         self.logger = logging.getLogger(__name__)
         self.voice_cache = {}
-        self.tone_presets = {
-            'excited': {'rate': 1.2, 'pitch': 1.1, 'volume': 1.2},
-            'calm': {'rate': 0.9, 'pitch': 0.95, 'volume': 0.9},
-            'authoritative': {'rate': 1.0, 'pitch': 1.05, 'volume': 1.1},
-            'friendly': {'rate': 1.1, 'pitch': 1.0, 'volume': 1.0},
-            'dramatic': {'rate': 0.95, 'pitch': 1.15, 'volume': 1.3},
-            'manipulative': {'rate': 1.05, 'pitch': 1.08, 'volume': 1.15}  # For psychological manipulation
-        }
+        
+        # Output directory is created once here instead of for every voiceover
+        self.output_dir = Path(__file__).resolve().parent.parent / 'assets' / 'voiceovers'
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Load configuration
         self.config = self._load_config()
@@ -69,12 +185,39 @@ class VoiceoverGenerator:
         # Initialize audio processing
         self._init_audio_processing()
         
+        # Content-addressable cache of synthesized audio, keyed by SHA-256 of (text, language, tone)
+        self.cache_dir = str(self.output_dir / '.tts_cache')
+        self._tts_manifest = self._load_tts_manifest()
+        self._tts_manifest_dirty = False
+        self._pending_fragments = {}
+        
+        # Keep-alive HTTP session shared by all requests, created on first use; it lives on
+        # the generator's own event loop, run by a background thread, so connections survive
+        # between calls and the sync API also works when the caller has a running loop
+        self._session = None
+        self._request_semaphore = None
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        
+        # Request pool drained by a background worker on the generator's loop, started on first submit()
+        self._queue = None
+        self._worker = None
+        self._semaphore = None
+        self._batches = set()
+        
+        # Offline TTS engine, created on first use (init is slow on some platforms). The engine is
+        # bound to the thread that creates it, so it lives on a dedicated single-thread executor
+        self._engine = None
+        self._engine_executor = None
+        
     def _load_config(self) -> Dict:
         """Load configuration from JSON file"""
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                # Each generator gets its own copy so mutating self.config cannot leak into the cache
+                return copy.deepcopy(_load_config_cached(os.path.abspath(self.config_path),
+                                                         os.path.getmtime(self.config_path)))
             else:
                 return self._get_default_config()
         except Exception as e:
@@ -106,112 +249,570 @@ class VoiceoverGenerator:
             self.logger.warning("No scripts provided for voiceover generation")
             return []
         
-        voiceovers = []
+        return self._run(self._generate_all(scripts))
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the generator's event loop, starting its thread on first use"""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever,
+                                                     name='voiceover-loop', daemon=True)
+                self._loop_thread.start()
+            return self._loop
+    
+    def _run(self, coro):
+        """Run a coroutine on the generator's event loop and wait for its result"""
+        loop = self._get_loop()
+        if threading.current_thread() is self._loop_thread:
+            coro.close()
+            raise RuntimeError("Synchronous VoiceoverGenerator methods cannot be called from its own event loop")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    async def _call_on_loop(self, coro):
+        """Await a coroutine on the generator's event loop from whichever loop is running"""
+        loop = self._get_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+    
+    async def _get_session(self):
+        """Return the shared aiohttp session, creating it on first use"""
+        if not AIOHTTP_AVAILABLE:
+            return None
         
-        for i, script in enumerate(scripts):
-            try:
-                voiceover = self._generate_single_voiceover(script, i)
-                if voiceover:
-                    voiceovers.append(voiceover)
-            except Exception as e:
-                self.logger.error(f"Error generating voiceover for script {i}: {e}")
-                continue
+        # The session is bound to the generator's loop, other loops must go through _call_on_loop
+        if asyncio.get_running_loop() is not self._loop:
+            raise RuntimeError("The shared HTTP session can only be used on the generator's event loop")
+        
+        if self._session is None or self._session.closed:
+            # Per-socket timeouts only, a total timeout would also count the wait for a pooled connection
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT_TTS_REQUESTS, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
+            )
+            self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TTS_REQUESTS)
+        return self._session
+    
+    async def aclose(self):
+        """Stop the request worker and close the shared aiohttp session"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        if asyncio.get_running_loop() is not self._loop:
+            return await self._call_on_loop(self.aclose())
+        
+        if self._worker is not None:
+            pending = [self._worker, *self._batches]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            
+            # Scripts still queued will never be picked up, release whoever waits on them
+            while not self._queue.empty():
+                _, _, future = self._queue.get_nowait()
+                future.cancel()
+        self._worker = None
+        self._flush_tts_manifest()
+        
+        if self._session is not None:
+            if not self._session.closed:
+                await self._session.close()
+            self._session = None
+    
+    def close(self):
+        """Close the shared aiohttp session and stop the generator's event loop"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            if loop is None:
+                return
+            if threading.current_thread() is thread:
+                raise RuntimeError("close() cannot be called from the generator's own event loop, use aclose()")
+            
+            if not loop.is_closed():
+                if thread.is_alive():
+                    asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+                    loop.call_soon_threadsafe(loop.stop)
+                    thread.join()
+                
+                # Cancel whatever still runs on the loop so callers blocked in the sync API are released
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.close()
+            self._loop = None
+            self._loop_thread = None
+            
+            if self._engine_executor is not None:
+                self._engine_executor.shutdown(wait=True)
+                self._engine_executor = None
+                self._engine = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    async def submit(self, script: Dict, index: int) -> Optional[Dict]:
+        """Queue a script for synthesis and wait for its voiceover, index is the script's position"""
+        return await self._call_on_loop(self._submit(script, index))
+    
+    async def _submit(self, script: Dict, index: int) -> Optional[Dict]:
+        """Queue a script on the generator's loop, the only loop the worker runs on"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((script, index, future))
+        return await future
+    
+    def _ensure_worker(self):
+        """Start the request worker if it is not running yet"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_TTS)
+            self._batches = set()
+            self._worker = asyncio.get_running_loop().create_task(self._pump())
+    
+    async def _pump(self):
+        """Drain queued scripts into batches as they arrive"""
+        while True:
+            items = [await self._queue.get()]
+            while not self._queue.empty() and len(items) < MAX_CONCURRENT_TTS:
+                items.append(self._queue.get_nowait())
+            
+            # Batches run in the background so newly queued scripts never wait for the previous batch to finish
+            batch = asyncio.ensure_future(self._run_batch(items))
+            self._batches.add(batch)
+            batch.add_done_callback(self._batches.discard)
+    
+    async def _run_batch(self, items: List[tuple]):
+        """Synthesize a batch of queued scripts and resolve their futures"""
+        try:
+            session = await self._get_session()
+            results = await asyncio.gather(
+                *(self._generate_single_voiceover_async(script, index, self._semaphore, session)
+                  for script, index, _ in items),
+                return_exceptions=True
+            )
+            self._flush_tts_manifest()
+            
+            for (_, _, future), result in zip(items, results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            # A cancelled batch (aclose) must not leave submit() callers waiting forever
+            for _, _, future in items:
+                if not future.done():
+                    future.cancel()
+    
+    async def _generate_all(self, scripts: List[Dict]) -> List[Dict]:
+        """Generate voiceovers for all scripts concurrently"""
+        results = await asyncio.gather(
+            *(self.submit(script, i) for i, script in enumerate(scripts)),
+            return_exceptions=True
+        )
+        
+        voiceovers = []
+        for i, result in enumerate(results):
+            if isinstance(result, asyncio.CancelledError):
+                self.logger.error(f"Voiceover for script {i} was cancelled, the generator was closed")
+            elif isinstance(result, Exception):
+                self.logger.error(f"Error generating voiceover for script {i}: {result}")
+            elif result:
+                voiceovers.append(result)
         
         return voiceovers
     
-    def _generate_single_voiceover(self, script: Dict, index: int) -> Optional[Dict]:
+    async def _generate_single_voiceover_async(self, script: Dict, index: int,
+                                               semaphore: asyncio.Semaphore,
+                                               session=None) -> Optional[Dict]:
         """Generate a single voiceover from script"""
+        loop = asyncio.get_running_loop()
         try:
             # Get script content
             content = script.get('content', '')
             title = script.get('title', f'Script {index+1}')
             
             # If content is empty or fallback, create better content
-            if not content or 'fallback' in content.lower():
+            enhanced_template = not content or 'fallback' in content.lower()
+            if enhanced_template:
                 content = self._create_enhanced_script_content(title, script)
             
-            # Create output directory
-            output_dir = os.path.join(os.path.dirname(__file__), '..', 'assets', 'voiceovers')
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Generate voiceover file
-            voiceover_filename = f"voiceover_{index+1}_{int(time.time())}.mp3"
-            voiceover_path = os.path.join(output_dir, voiceover_filename)
+            # One timestamp shared by the file name, id and generation time; the random token keeps
+            # names unique when the same index is submitted twice within a second
+            ts = time.time_ns() // 1_000_000_000
+            voiceover_path = str(self.output_dir / f"voiceover_{index+1}_{ts}_{uuid.uuid4().hex[:8]}.mp3")
+            tone = script.get('tone', self.config.get('default_tone', 'friendly'))
+            language = self.config.get('default_language', 'en')
             
-            # Generate voiceover using gTTS
+            # Synthesis strategies in order of preference, the local offline engine needs no network round-trips
+            strategies = []
+            if PYTTSX3_AVAILABLE and self.config.get('prefer_offline', True):
+                strategies.append(('pyttsx3', functools.partial(
+                    self._offline_synth, content, voiceover_path, tone)))
             if GTTS_AVAILABLE:
+                strategies.append(('gtts', functools.partial(
+                    self._gtts_synth, content, title, voiceover_path, language, tone,
+                    enhanced_template, semaphore, session)))
+            
+            for method, synth in strategies:
                 try:
-                    # Create gTTS object with enhanced settings
-                    tts = gtts.gTTS(
-                        text=content,
-                        lang='en',
-                        slow=False,
-                        lang_check=True
-                    )
-                    
-                    # Save the voiceover
-                    tts.save(voiceover_path)
+                    audio_file, metadata = await synth()
                     
                     # Verify file was created
-                    if os.path.exists(voiceover_path) and os.path.getsize(voiceover_path) > 0:
-                        self.logger.info(f"Generated voiceover: {voiceover_path}")
-                        
-                        return {
-                            'id': f"voiceover_{index+1}_{int(time.time())}",
-                            'title': title,
-                            'audio_file': voiceover_path,
-                            'content': content,
-                            'duration': self._estimate_audio_duration(content),
-                            'language': 'en',
-                            'metadata': {
-                                'generated_at': datetime.now().isoformat(),
-                                'script_id': script.get('id', f'script_{index+1}'),
-                                'method': 'gtts',
-                                'enhanced': True
-                            }
-                        }
-                    else:
+                    if self._file_size(audio_file) == 0:
                         raise Exception("Voiceover file was not created properly")
-                        
+                    
+                    self.logger.info(f"Generated {method} voiceover: {audio_file}")
+                    return self._build_voiceover_record(ts, index, script, title, content, audio_file, method, **metadata)
+                    
                 except Exception as e:
-                    self.logger.error(f"Error generating gTTS voiceover: {e}")
-                    return self._create_fallback_voiceover(script, index, voiceover_path)
+                    self.logger.warning(f"{method} voiceover failed: {e}")
             
-            else:
-                self.logger.warning("gTTS not available, creating fallback voiceover")
-                return self._create_fallback_voiceover(script, index, voiceover_path)
+            self.logger.warning("No TTS engine produced audio, creating fallback voiceover")
+            return await loop.run_in_executor(None, self._create_fallback_voiceover, script, index, voiceover_path, ts)
                 
         except Exception as e:
             self.logger.error(f"Error in voiceover generation: {e}")
             return None
     
+    def _build_voiceover_record(self, ts: int, index: int, script: Dict, title: str, content: str,
+                                audio_file: str, method: str, enhanced: bool = True,
+                                duration: float = None, **metadata) -> Dict:
+        """Build the voiceover dict returned by every generation path"""
+        return {
+            'id': os.path.splitext(os.path.basename(audio_file))[0],  # Same unique stem as the audio file
+            'title': title,
+            'audio_file': audio_file,
+            'content': content,
+            'duration': self._estimate_audio_duration(content) if duration is None else duration,
+            'language': self.config.get('default_language', 'en'),
+            'metadata': {
+                'generated_at': datetime.fromtimestamp(ts).isoformat(timespec='seconds'),
+                'script_id': script.get('id', f'script_{index+1}'),
+                'method': method,
+                'enhanced': enhanced,
+                **metadata
+            }
+        }
+    
+    async def _offline_synth(self, content: str, voiceover_path: str, tone: str):
+        """Offline strategy, returns (audio_file, extra metadata)"""
+        if self._engine_executor is None:
+            self._engine_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pyttsx3',
+                                                       initializer=self._init_engine_thread)
+        
+        loop = asyncio.get_running_loop()
+        audio_file = await loop.run_in_executor(self._engine_executor, self._synthesize_pyttsx3,
+                                                content, voiceover_path, tone)
+        return audio_file, {}
+    
+    async def _gtts_synth(self, content: str, title: str, voiceover_path: str, language: str, tone: str,
+                          enhanced_template: bool, semaphore: asyncio.Semaphore, session=None):
+        """gTTS strategy, returns (audio_file, extra metadata)"""
+        if enhanced_template:
+            # Static template sentences are synthesized once and shared, only the title is new
+            await self._synthesize_template_async(title, voiceover_path, language, tone, semaphore, session)
+            return voiceover_path, {'cached': False}
+        
+        # Reuse previously synthesized audio for identical inputs
+        cache_key = self._tts_cache_key(content, language, tone)
+        cached = self._restore_cached_tts(cache_key, voiceover_path)
+        if not cached:
+            async with semaphore:
+                await self._synthesize_gtts_async(content, voiceover_path, language, session)
+            if self._file_size(voiceover_path) > 0:
+                self._store_cached_tts(cache_key, voiceover_path)
+        
+        return voiceover_path, {'cached': cached}
+    
+    def _init_engine_thread(self):
+        """Prepare the offline TTS thread, SAPI5 needs COM initialized on the thread that uses it"""
+        if os.name == 'nt':
+            try:
+                import comtypes
+                comtypes.CoInitialize()
+            except Exception as e:
+                self.logger.warning(f"Could not initialize COM for offline TTS: {e}")
+    
+    def _synthesize_pyttsx3(self, content: str, voiceover_path: str, tone: str) -> str:
+        """Synthesize speech with the local pyttsx3 engine, returns the written WAV path"""
+        wav_path = os.path.splitext(voiceover_path)[0] + '.wav'
+        preset = self.TONE_PRESETS.get(tone, self.TONE_PRESETS['friendly'])
+        
+        # Only ever runs on the single engine thread, which creates and owns the engine
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+        self._engine.setProperty('rate', int(180 * preset['rate']))
+        self._engine.save_to_file(content, wav_path)
+        self._engine.runAndWait()
+        
+        return wav_path
+    
+    async def _synthesize_gtts_async(self, content: str, voiceover_path: str, language: str, session=None):
+        """Synthesize speech with gTTS, sending its requests through aiohttp when available"""
+        tts = gtts.gTTS(
+            text=content,
+            lang=language,
+            slow=False,
+            lang_check=True
+        )
+        
+        if session is None:
+            # No aiohttp: run the blocking gTTS client in a worker thread instead
+            await asyncio.get_running_loop().run_in_executor(None, self._replace_file, voiceover_path, tts.save)
+            return
+        
+        # Reuse gTTS's own request building (tokenizing + batchexecute payload) and only replace the transport.
+        # gTTS sends one request per text chunk serially; fetch them all at once and join the MP3 frames in order
+        parts = await asyncio.gather(*(
+            self._fetch_gtts_part(session, request) for request in tts._prepare_requests()
+        ))
+        
+        await self._write_bytes_async(voiceover_path, parts)
+    
+    async def _makedirs_async(self, path: str):
+        """Create a directory without blocking the event loop"""
+        if AIOFILES_AVAILABLE:
+            await aiofiles.os.makedirs(path, exist_ok=True)
+        else:
+            os.makedirs(path, exist_ok=True)
+    
+    async def _read_bytes_async(self, path: str) -> bytes:
+        """Read a whole file without blocking the event loop"""
+        if AIOFILES_AVAILABLE:
+            async with aiofiles.open(path, 'rb') as f:
+                return await f.read()
+        with open(path, 'rb') as f:
+            return f.read()
+    
+    async def _write_bytes_async(self, path: str, chunks: List[bytes]):
+        """Write chunks to a file in order without blocking the event loop"""
+        if not AIOFILES_AVAILABLE:
+            self._replace_file(path, lambda tmp_path: self._write_chunks(tmp_path, chunks))
+            return
+        
+        tmp_path = self._temp_path(path)
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    await f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove_quietly(tmp_path)
+            raise
+    
+    @staticmethod
+    def _write_chunks(path: str, chunks: List[bytes]):
+        """Write chunks to a file in order"""
+        with open(path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+    
+    @staticmethod
+    def _temp_path(path: str) -> str:
+        """Unique sibling of path, on the same filesystem so os.replace can move it into place"""
+        return f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    
+    @staticmethod
+    def _remove_quietly(path: str):
+        """Delete a file if it exists"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def _replace_file(self, path: str, write: Callable[[str], None]):
+        """Run write() on a temp file and move it onto path.
+        
+        Output files and cache entries may be hardlinks of each other, so a target is never
+        truncated in place, that would rewrite every linked copy as well.
+        """
+        tmp_path = self._temp_path(path)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove_quietly(tmp_path)
+            raise
+    
+    async def _fetch_gtts_part(self, session, request) -> bytes:
+        """POST one prepared gTTS request and return its MP3 bytes"""
+        # Chunks of every running voiceover share one cap, so none sit in the connector queue
+        async with self._request_semaphore:
+            async with session.post(request.url, data=request.body, headers=dict(request.headers)) as response:
+                response.raise_for_status()
+                return _decode_gtts_response(await response.text())
+    
+    async def _synthesize_template_async(self, title: str, voiceover_path: str, language: str, tone: str,
+                                         semaphore: asyncio.Semaphore, session=None):
+        """Build an enhanced-template voiceover from cached fragments, synthesizing only what is missing"""
+        # An empty title leaves an empty fragment, which gTTS rejects ("No text to speak"), skip it
+        texts = [text.strip() for _, text in self._enhanced_script_parts(title)]
+        fragment_paths = await asyncio.gather(*(
+            self._synthesize_fragment_async(text, language, tone, semaphore, session)
+            for text in texts if text
+        ))
+        
+        # gTTS emits MP3 frames with identical encoding parameters, so fragments concatenate without re-encoding
+        fragments = [await self._read_bytes_async(fragment_path) for fragment_path in fragment_paths]
+        await self._write_bytes_async(voiceover_path, fragments)
+    
+    async def _synthesize_fragment_async(self, text: str, language: str, tone: str,
+                                         semaphore: asyncio.Semaphore, session=None) -> str:
+        """Return the cached audio path for a text fragment, synthesizing it at most once"""
+        key = self._tts_cache_key(text, language, tone)
+        entry = self._tts_manifest.get(key)
+        if entry and self._file_size(entry['path']) > 0:
+            entry['lastUsedAt'] = time.time()
+            self._tts_manifest_dirty = True
+            return entry['path']
+        
+        # Concurrent voiceovers share the same static fragments; wait on an in-flight synthesis instead of repeating it
+        pending = self._pending_fragments.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._synthesize_fragment_to_cache(key, text, language, semaphore, session))
+            self._pending_fragments[key] = pending
+            pending.add_done_callback(lambda _: self._pending_fragments.pop(key, None))
+        return await pending
+    
+    async def _synthesize_fragment_to_cache(self, key: str, text: str, language: str,
+                                            semaphore: asyncio.Semaphore, session=None) -> str:
+        """Synthesize a fragment straight into the TTS cache"""
+        await self._makedirs_async(self.cache_dir)
+        cached_path = os.path.join(self.cache_dir, f"{key}.mp3")
+        
+        async with semaphore:
+            await self._synthesize_gtts_async(text, cached_path, language, session)
+        
+        # An error page decodes to no audio, never cache an empty fragment
+        if self._file_size(cached_path) == 0:
+            try:
+                os.remove(cached_path)
+            except OSError:
+                pass
+            raise Exception(f"gTTS returned no audio for fragment {key}")
+        
+        self._register_cached_tts(key, cached_path)
+        return cached_path
+    
+    def _tts_cache_key(self, content: str, language: str, tone: str) -> str:
+        """Hash the synthesis inputs into a cache key"""
+        return hashlib.sha256(f"{content}|{language}|{tone}".encode('utf-8')).hexdigest()
+    
+    def _load_tts_manifest(self) -> Dict:
+        """Load the TTS cache manifest ({key: {createdAt, lastUsedAt, path}})"""
+        manifest_path = os.path.join(self.cache_dir, 'manifest.json')
+        try:
+            if os.path.exists(manifest_path):
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Error loading TTS cache manifest, starting empty: {e}")
+        return {}
+    
+    def _save_tts_manifest(self):
+        """Persist the TTS cache manifest"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(os.path.join(self.cache_dir, 'manifest.json'), 'wb') as f:
+                f.write(_dumps(self._tts_manifest))
+        except Exception as e:
+            self.logger.warning(f"Error saving TTS cache manifest: {e}")
+    
+    def _flush_tts_manifest(self):
+        """Persist the TTS cache manifest if it changed since the last flush"""
+        if self._tts_manifest_dirty:
+            self._tts_manifest_dirty = False
+            self._save_tts_manifest()
+    
+    def _link_or_copy(self, source: str, destination: str):
+        """Hardlink a file, copying when linking is not possible"""
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+    
+    def _restore_cached_tts(self, key: str, voiceover_path: str) -> bool:
+        """Place cached audio at voiceover_path, returns False on a cache miss"""
+        entry = self._tts_manifest.get(key)
+        if not entry or self._file_size(entry['path']) == 0:
+            return False
+        
+        try:
+            self._link_or_copy(entry['path'], voiceover_path)
+        except OSError as e:
+            self.logger.warning(f"Error restoring cached voiceover: {e}")
+            return False
+        
+        # The manifest is written once per batch by _flush_tts_manifest, not on every hit
+        entry['lastUsedAt'] = time.time()
+        self._tts_manifest_dirty = True
+        return True
+    
+    def _store_cached_tts(self, key: str, voiceover_path: str):
+        """Add freshly synthesized audio to the cache"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cached_path = os.path.join(self.cache_dir, key + os.path.splitext(voiceover_path)[1])
+            if not os.path.exists(cached_path):
+                self._link_or_copy(voiceover_path, cached_path)
+        except OSError as e:
+            self.logger.warning(f"Error caching voiceover: {e}")
+            return
+        
+        self._register_cached_tts(key, cached_path)
+    
+    def _register_cached_tts(self, key: str, cached_path: str):
+        """Record a cache entry in the manifest, evicting least recently used entries"""
+        now = time.time()
+        self._tts_manifest[key] = {'createdAt': now, 'lastUsedAt': now, 'path': cached_path}
+        
+        max_entries = self.config.get('tts_cache_max_entries', 500)
+        while len(self._tts_manifest) > max_entries:
+            oldest = min(self._tts_manifest, key=lambda k: self._tts_manifest[k]['lastUsedAt'])
+            evicted = self._tts_manifest.pop(oldest)
+            try:
+                os.remove(evicted['path'])
+            except OSError:
+                pass
+        
+        self._tts_manifest_dirty = True
+    
+    def _enhanced_script_parts(self, title: str) -> List[tuple]:
+        """Split the enhanced script into (kind, text) parts, kind is 'static_<i>' or 'dynamic'"""
+        return [
+            ('dynamic', title) if part is None else (f'static_{i}', part)
+            for i, part in enumerate(ENHANCED_SCRIPT_TEMPLATE)
+        ]
+    
     def _create_enhanced_script_content(self, title: str, script: Dict) -> str:
         """Create enhanced script content when original is fallback"""
         try:
             # Create engaging content based on title
-            enhanced_content = f"""
-Welcome to our channel! Today we're exploring {title}.
-
-This is a fascinating topic that will change your perspective completely. 
-What you're about to learn will surprise you and make you think differently.
-
-The key insights we'll cover today are absolutely crucial for understanding this subject.
-You won't want to miss what comes next.
-
-Stay tuned as we dive deep into the most important aspects of {title}.
-This information could be life-changing for you.
-
-Remember to like, subscribe, and share this video with others who might benefit.
-Thank you for watching, and we'll see you in the next video!
-"""
+            enhanced_content = ''.join(text for _, text in self._enhanced_script_parts(title))
             return enhanced_content
             
         except Exception as e:
             self.logger.error(f"Error creating enhanced content: {e}")
             return f"Welcome to our channel! Today we're exploring {title}. This is an amazing topic that will change your perspective. Stay tuned for more content!"
     
-    def _create_fallback_voiceover(self, script: Dict, index: int, voiceover_path: str) -> Dict:
+    def _create_fallback_voiceover(self, script: Dict, index: int, voiceover_path: str, ts: int = None) -> Dict:
         """Create a fallback voiceover when gTTS fails"""
+        if ts is None:
+            ts = time.time_ns() // 1_000_000_000
+        
         try:
             title = script.get('title', f'Script {index+1}')
             
@@ -220,53 +821,40 @@ Thank you for watching, and we'll see you in the next video!
             
             # Try to create a simple audio file
             try:
-                import numpy as np
-                import wave
+                if not NUMPY_AVAILABLE:
+                    raise ImportError("numpy is required to synthesize fallback audio")
                 
                 # Create a simple beep sound
                 sample_rate = 44100
                 duration = 10.0  # 10 seconds
                 frequency = 440.0  # A4 note
                 
-                # Generate sine wave
-                t = np.linspace(0, duration, int(sample_rate * duration), False)
-                audio_data = np.sin(2 * np.pi * frequency * t) * 0.3
-                
-                # Convert to 16-bit PCM
-                audio_data = (audio_data * 32767).astype(np.int16)
+                # Generate the smallest block holding a whole number of cycles, then repeat it to full length
+                block_size = sample_rate // math.gcd(sample_rate, int(frequency))
+                t = np.arange(block_size, dtype=np.float32) / sample_rate
+                block = (np.sin(2 * np.pi * frequency * t) * (0.3 * 32767)).astype(np.int16)  # 16-bit PCM
+                audio_data = np.resize(block, int(sample_rate * duration))
                 
-                # Save as WAV first, then convert to MP3 if possible
-                wav_path = voiceover_path.replace('.mp3', '.wav')
-                with wave.open(wav_path, 'w') as wav_file:
-                    wav_file.setnchannels(1)  # Mono
-                    wav_file.setsampwidth(2)  # 16-bit
-                    wav_file.setframerate(sample_rate)
-                    wav_file.writeframes(audio_data.tobytes())
+                if LAMEENC_AVAILABLE:
+                    # Encode MP3 in-process, no ffmpeg subprocess
+                    encoder = lameenc.Encoder()
+                    encoder.set_bit_rate(64)
+                    encoder.set_in_sample_rate(sample_rate)
+                    encoder.set_channels(1)
+                    encoder.set_quality(7)
+                    mp3_data = encoder.encode(audio_data.tobytes()) + encoder.flush()
+                    self._replace_file(voiceover_path, lambda tmp_path: self._write_chunks(tmp_path, [mp3_data]))
+                else:
+                    # Without an encoder the fallback audio is written as WAV
+                    voiceover_path = os.path.splitext(voiceover_path)[0] + '.wav'
+                    with wave.open(voiceover_path, 'w') as wav_file:
+                        wav_file.setnchannels(1)  # Mono
+                        wav_file.setsampwidth(2)  # 16-bit
+                        wav_file.setframerate(sample_rate)
+                        wav_file.writeframes(audio_data.tobytes())
                 
-                # Try to convert WAV to MP3
-                try:
-                    from pydub import AudioSegment
-                    audio = AudioSegment.from_wav(wav_path)
-                    audio.export(voiceover_path, format="mp3")
-                    os.remove(wav_path)  # Clean up WAV file
-                except:
-                    # If MP3 conversion fails, use WAV file
-                    voiceover_path = wav_path
-                
-                return {
-                    'id': f"voiceover_{index+1}_{int(time.time())}",
-                    'title': title,
-                    'audio_file': voiceover_path,
-                    'content': fallback_content,
-                    'duration': duration,
-                    'language': 'en',
-                    'metadata': {
-                        'generated_at': datetime.now().isoformat(),
-                        'script_id': script.get('id', f'script_{index+1}'),
-                        'method': 'fallback_audio',
-                        'enhanced': False
-                    }
-                }
+                return self._build_voiceover_record(ts, index, script, title, fallback_content, voiceover_path,
+                                                    'fallback_audio', enhanced=False, duration=duration)
                 
             except Exception as e:
                 self.logger.error(f"Error creating fallback audio: {e}")
@@ -276,11 +864,30 @@ Thank you for watching, and we'll see you in the next video!
             self.logger.error(f"Error creating fallback voiceover: {e}")
             return None
     
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _estimate_audio_duration(text: str) -> float:
+        """Estimate spoken duration in seconds from the character count"""
+        return round(len(text) * SECONDS_PER_CHAR, 2)
+    
+    @staticmethod
+    def _file_size(path: str) -> int:
+        """Size of a file in bytes with a single stat call, 0 if it does not exist"""
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return 0
+    
     def _get_audio_duration(self, audio_path: str) -> float:
         """Get audio file duration"""
         try:
-            if PYDUB_AVAILABLE:
-                from pydub import AudioSegment
+            # Read durations from file headers/frames instead of decoding the whole file
+            if audio_path.lower().endswith('.wav'):
+                with wave.open(audio_path, 'rb') as wav_file:
+                    return wav_file.getnframes() / wav_file.getframerate()
+            elif MUTAGEN_AVAILABLE:
+                return MutagenFile(audio_path).info.length
+            elif PYDUB_AVAILABLE:
                 audio = AudioSegment.from_file(audio_path)
                 return len(audio) / 1000.0  # Convert to seconds
             else:
@@ -292,49 +899,101 @@ Thank you for watching, and we'll see you in the next video!
     def _generate_fallback_voiceover(self, script: Dict) -> Dict:
         """Generate a fallback voiceover when TTS is not available"""
         text_content = self._extract_voiceover_text(script)
+        now = datetime.now()
+        stamp = now.strftime('%Y%m%d_%H%M%S')
         
         # Create a placeholder file
         output_dir = self.config.get('output_directory', 'voiceovers')
         os.makedirs(output_dir, exist_ok=True)
         
-        placeholder_file = f"{output_dir}/placeholder_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        placeholder_file = f"{output_dir}/placeholder_{stamp}.txt"
         
         with open(placeholder_file, 'w', encoding='utf-8') as f:
             f.write(f"VOICEOVER PLACEHOLDER\n\nText Content:\n{text_content}\n\nPlease generate voiceover manually or install TTS dependencies.")
         
         return {
-            'id': f"fallback_voiceover_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            'id': f"fallback_voiceover_{stamp}",
             'script_id': script.get('id', 'unknown'),
             'title': script.get('title', 'Fallback Voiceover'),
             'audio_file': placeholder_file,
             'text_content': text_content,
             'tone': 'friendly',
             'metadata': {
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now.isoformat(timespec='seconds'),
                 'method': 'fallback',
                 'duration': 0.0,
-                'file_size': os.path.getsize(placeholder_file) if os.path.exists(placeholder_file) else 0,
+                'file_size': self._file_size(placeholder_file),
                 'enhanced': False
             }
         }
     
+    def _extract_voiceover_text(self, script: Dict) -> str:
+        """Get the text to be spoken for a script"""
+        content = script.get('content', '')
+        if content and 'fallback' not in content.lower():
+            return content
+        
+        # Fall back to the script sections, then to the enhanced template
+        sections = script.get('sections') or {}
+        section_text = ' '.join(text for text in sections.values() if isinstance(text, str) and text.strip())
+        if section_text:
+            return section_text
+        
+        return self._create_enhanced_script_content(script.get('title', 'this topic'), script)
+    
+    async def _generate_audio_async(self, text: str, tone: str, language: str,
+                                    semaphore: asyncio.Semaphore = None) -> Optional[str]:
+        """Synthesize text in the given language, returns the audio file path"""
+        # The random token keeps concurrent runs for different scripts in the same second apart
+        audio_path = str(self.output_dir / f"voiceover_{language}_{int(time.time())}_{uuid.uuid4().hex[:8]}.mp3")
+        
+        cache_key = self._tts_cache_key(text, language, tone)
+        if self._restore_cached_tts(cache_key, audio_path):
+            return audio_path
+        
+        semaphore = semaphore or asyncio.Semaphore(MAX_CONCURRENT_TTS)
+        async with semaphore:
+            await self._synthesize_gtts_async(text, audio_path, language, await self._get_session())
+        
+        if self._file_size(audio_path) > 0:
+            self._store_cached_tts(cache_key, audio_path)
+            return audio_path
+        return None
+    
     def create_multi_language_voiceover(self, script: Dict, languages: List[str]) -> Dict[str, str]:
         """Create voiceover in multiple languages"""
         if not GTTS_AVAILABLE:
             self.logger.warning("gTTS not available for multi-language voiceover")
             return {}
         
-        voiceovers = {}
+        return self._run(self.create_multi_language_voiceover_async(script, languages))
+    
+    async def create_multi_language_voiceover_async(self, script: Dict, languages: List[str]) -> Dict[str, str]:
+        """Create voiceovers for all languages concurrently"""
+        if not GTTS_AVAILABLE:
+            self.logger.warning("gTTS not available for multi-language voiceover")
+            return {}
+        
+        return await self._call_on_loop(self._create_multi_language_voiceover(script, languages))
+    
+    async def _create_multi_language_voiceover(self, script: Dict, languages: List[str]) -> Dict[str, str]:
+        """Generate every language on the generator's loop, where the shared session lives"""
         text_content = self._extract_voiceover_text(script)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TTS)
         
-        for language in languages:
-            try:
-                audio_file = self._generate_audio(text_content, 'friendly', language)
-                if audio_file:
-                    voiceovers[language] = audio_file
-            except Exception as e:
-                self.logger.error(f"Error generating voiceover for language {language}: {e}")
-                continue
+        results = await asyncio.gather(
+            *(self._generate_audio_async(text_content, 'friendly', language, semaphore)
+              for language in languages),
+            return_exceptions=True
+        )
+        self._flush_tts_manifest()
+        
+        voiceovers = {}
+        for language, audio_file in zip(languages, results):
+            if isinstance(audio_file, Exception):
+                self.logger.error(f"Error generating voiceover for language {language}: {audio_file}")
+            elif audio_file:
+                voiceovers[language] = audio_file
         
         return voiceovers
     
@@ -346,8 +1005,8 @@ Thank you for watching, and we'll see you in the next video!
         os.makedirs(os.path.dirname(filename), exist_ok=True)
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(voiceover, f, indent=2, ensure_ascii=False)
+            with open(filename, 'wb') as f:
+                f.write(_dumps(voiceover))
             
             self.logger.info(f"Voiceover metadata saved to {filename}")
             return filename
@@ -7,6 +7,8 @@ import sys
 import os
 import json
 import subprocess
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 def test_python_version():
@@ -19,6 +21,13 @@ def test_python_version():
         print(f"  Python {sys.version_info.major}.{sys.version_info.minor} ✗ (3.8+ required)")
         return False
 
+def _try_import(module):
+    """Check that a module can be found without executing it"""
+    try:
+        return module, importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return module, False
+
 def test_imports():
     """Test required imports"""
     print("✓ Testing imports...")
@@ -45,20 +54,22 @@ def test_imports():
     
     all_good = True
     
+    # Lookups are independent, so run them in parallel
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        found = dict(executor.map(_try_import, required_modules + optional_modules))
+    
     for module in required_modules:
-        try:
-            __import__(module)
+        if found[module]:
             print(f"  {module} ✓")
-        except ImportError:
+        else:
             print(f"  {module} ✗")
             all_good = False
     
     print("  Optional modules:")
     for module in optional_modules:
-        try:
-            __import__(module)
+        if found[module]:
             print(f"    {module} ✓")
-        except ImportError:
+        else:
             print(f"    {module} ✗ (install with: pip install {module})")
     
     return all_good
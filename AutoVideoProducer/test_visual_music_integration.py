@@ -4,43 +4,102 @@ Test Visual and Music Generator Integration
 Verifies that both modules are properly integrated and working
 """
 
+import io
 import sys
 import os
+import shutil
+import functools
+from collections import namedtuple
+import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Add the src directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+# Distribution names whose import name differs
+IMPORT_NAMES = {'pillow': 'PIL'}
 
-def test_imports():
+# Add the src directory to the path (once, so re-imports don't grow it)
+SRC_DIR = os.path.join(os.path.dirname(__file__), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+# Generator modules are imported once here, the tests check for the None sentinels.
+# Any exception is caught, a module failing at import time must not abort the whole report
+try:
+    from visual_generator import VisualGenerator
+    VISUAL_IMPORT_ERROR = None
+except Exception as e:
+    VisualGenerator = None
+    VISUAL_IMPORT_ERROR = e
+
+try:
+    from music_generator import MusicGenerator
+    MUSIC_IMPORT_ERROR = None
+except Exception as e:
+    MusicGenerator = None
+    MUSIC_IMPORT_ERROR = e
+
+# (module name, attribute) -> resolved object, shared by every test
+_IMPORT_CACHE = {}
+
+def _cached_import(module_name, item_name):
+    """Import module_name.item_name once and reuse the object afterwards"""
+    key = (module_name, item_name)
+    obj = _IMPORT_CACHE.get(key)
+    if obj is None:
+        modules = sys.modules
+        if module_name not in modules:
+            importlib.import_module(module_name)
+        try:
+            obj = getattr(modules[module_name], item_name)
+        except AttributeError:
+            raise ImportError(f"cannot import name '{item_name}' from '{module_name}'")
+        _IMPORT_CACHE[key] = obj
+    return obj
+
+# Generators are expensive to construct, build each one once per process
+@functools.lru_cache(maxsize=None)
+def _visual_gen():
+    return VisualGenerator()
+
+@functools.lru_cache(maxsize=None)
+def _music_gen():
+    return MusicGenerator()
+
+@functools.lru_cache(maxsize=None)
+def _app():
+    return _cached_import('main', 'AutoVideoProducer')()
+
+def test_imports(out=None):
     """Test that all modules can be imported"""
-    print("Testing module imports...")
+    out = out or sys.stdout
+    print("Testing module imports...", file=out)
     
-    try:
-        from visual_generator import VisualGenerator
-        print("✓ VisualGenerator imported successfully")
-    except ImportError as e:
-        print(f"✗ VisualGenerator import failed: {e}")
+    if VisualGenerator is None:
+        print(f"✗ VisualGenerator import failed: {VISUAL_IMPORT_ERROR}", file=out)
         return False
+    print("✓ VisualGenerator imported successfully", file=out)
     
-    try:
-        from music_generator import MusicGenerator
-        print("✓ MusicGenerator imported successfully")
-    except ImportError as e:
-        print(f"✗ MusicGenerator import failed: {e}")
+    if MusicGenerator is None:
+        print(f"✗ MusicGenerator import failed: {MUSIC_IMPORT_ERROR}", file=out)
         return False
+    print("✓ MusicGenerator imported successfully", file=out)
     
     return True
 
-def test_visual_generator():
+def test_visual_generator(out=None):
     """Test visual generator functionality"""
-    print("\nTesting Visual Generator...")
+    out = out or sys.stdout
+    print("\nTesting Visual Generator...", file=out)
+    
+    if VisualGenerator is None:
+        print(f"✗ Visual generator test failed: {VISUAL_IMPORT_ERROR}", file=out)
+        return False
     
     try:
-        from visual_generator import VisualGenerator
-        
         # Initialize generator
-        generator = VisualGenerator()
-        print("✓ VisualGenerator initialized")
+        generator = _visual_gen()
+        print("✓ VisualGenerator initialized", file=out)
         
         # Test script parsing
         test_script = """
@@ -50,80 +109,109 @@ def test_visual_generator():
         """
         
         cues = generator.parse_script_for_visual_cues(test_script)
-        print(f"✓ Found {len(cues)} visual cues")
+        print(f"✓ Found {len(cues)} visual cues", file=out)
         
         # Test configuration
         config = generator.config
-        print(f"✓ Configuration loaded: {config['image_width']}x{config['image_height']}")
+        print(f"✓ Configuration loaded: {config['image_width']}x{config['image_height']}", file=out)
         
         # Test generation stats
         stats = generator.get_generation_stats()
-        print(f"✓ Generation stats available: {stats['sd_available']}")
+        print(f"✓ Generation stats available: {stats['sd_available']}", file=out)
         
         return True
         
     except Exception as e:
-        print(f"✗ Visual generator test failed: {e}")
+        print(f"✗ Visual generator test failed: {e}", file=out)
         return False
 
-def test_music_generator():
+def test_music_generator(out=None):
     """Test music generator functionality"""
-    print("\nTesting Music Generator...")
+    out = out or sys.stdout
+    print("\nTesting Music Generator...", file=out)
+    
+    if MusicGenerator is None:
+        print(f"✗ Music generator test failed: {MUSIC_IMPORT_ERROR}", file=out)
+        return False
     
     try:
-        from music_generator import MusicGenerator
-        
         # Initialize generator
-        generator = MusicGenerator()
-        print("✓ MusicGenerator initialized")
+        generator = _music_gen()
+        print("✓ MusicGenerator initialized", file=out)
         
         # Test style determination
         video_types = ["history", "motivation", "corporate", "nature"]
         for video_type in video_types:
             style = generator.determine_music_style(video_type)
-            print(f"✓ {video_type} → {style} style")
+            print(f"✓ {video_type} → {style} style", file=out)
         
         # Test configuration
         config = generator.config
-        print(f"✓ Configuration loaded: {len(config['music_styles'])} music styles")
+        print(f"✓ Configuration loaded: {len(config['music_styles'])} music styles", file=out)
         
         # Test generation stats
         stats = generator.get_generation_stats()
-        print(f"✓ Generation stats available: Music21={stats['music21_available']}, Audiocraft={stats['audiocraft_available']}")
+        print(f"✓ Generation stats available: Music21={stats['music21_available']}, Audiocraft={stats['audiocraft_available']}", file=out)
         
         return True
         
     except Exception as e:
-        print(f"✗ Music generator test failed: {e}")
+        print(f"✗ Music generator test failed: {e}", file=out)
         return False
 
-def test_integration():
+def test_integration(out=None):
     """Test integration with main application"""
-    print("\nTesting Main Application Integration...")
+    out = out or sys.stdout
+    print("\nTesting Main Application Integration...", file=out)
     
     try:
-        # Import main application modules
-        from main import AutoVideoProducer
-        
-        # Test that the modules are available in main
-        app = AutoVideoProducer()
-        print("✓ AutoVideoProducer initialized")
+        # Test that the modules are available in main, imported lazily since it pulls in the whole app
+        app = _app()
+        print("✓ AutoVideoProducer initialized", file=out)
         
         # Test configuration loading
         if app.load_config():
-            print("✓ Configuration loaded in main app")
+            print("✓ Configuration loaded in main app", file=out)
         else:
-            print("⚠ Configuration loading failed (may be expected)")
+            print("⚠ Configuration loading failed (may be expected)", file=out)
         
         return True
         
     except Exception as e:
-        print(f"✗ Main application integration test failed: {e}")
+        print(f"✗ Main application integration test failed: {e}", file=out)
         return False
 
-def test_dependencies():
+# Probe results for the life of the process, re-runs skip the sys.path scan
+_MISSING = set()
+_PRESENT = {}
+
+def _probe(dep):
+    """Check whether a single dependency is available"""
+    if dep == 'ollama':
+        # Check if ollama command is on PATH, no need to spawn it
+        return shutil.which('ollama') is not None
+    
+    if dep in _PRESENT:
+        return True
+    if dep in _MISSING:
+        return False
+    
+    # Locate the package without executing it, torch and friends are slow to import
+    try:
+        spec = importlib.util.find_spec(IMPORT_NAMES.get(dep, dep))
+    except (ImportError, ValueError):
+        spec = None
+    
+    if spec is None:
+        _MISSING.add(dep)
+        return False
+    _PRESENT[dep] = spec
+    return True
+
+def test_dependencies(out=None):
     """Test that required dependencies are available"""
-    print("\nTesting Dependencies...")
+    out = out or sys.stdout
+    print("\nTesting Dependencies...", file=out)
     
     dependencies = {
         'torch': 'PyTorch for AI models',
@@ -138,64 +226,108 @@ def test_dependencies():
     
     all_available = True
     
+    # Probes are independent, run them concurrently and report in the original order
+    with ThreadPoolExecutor(max_workers=len(dependencies)) as executor:
+        available = dict(zip(dependencies, executor.map(_probe, dependencies)))
+    
     for dep, description in dependencies.items():
-        try:
-            if dep == 'ollama':
-                # Check if ollama command is available
-                import subprocess
-                result = subprocess.run(['ollama', '--version'], capture_output=True, text=True)
-                if result.returncode == 0:
-                    print(f"✓ {dep}: {description}")
-                else:
-                    print(f"⚠ {dep}: {description} (not available)")
-            else:
-                __import__(dep)
-                print(f"✓ {dep}: {description}")
-        except ImportError:
-            print(f"✗ {dep}: {description} (not installed)")
+        if available[dep]:
+            print(f"✓ {dep}: {description}", file=out)
+        elif dep == 'ollama':
+            print(f"⚠ {dep}: {description} (not available)", file=out)
+        else:
+            print(f"✗ {dep}: {description} (not installed)", file=out)
             all_available = False
     
     return all_available
 
+def _execution_batches(tests):
+    """Group tests into layers with Kahn's algorithm, each layer only depends on earlier ones"""
+    remaining = {name: set(node.deps) for name, node in tests.items()}
+    batches = []
+    
+    while remaining:
+        batch = [name for name, deps in remaining.items() if not deps]
+        if not batch:
+            raise ValueError(f"Circular test dependencies: {', '.join(remaining)}")
+        
+        batches.append(batch)
+        for name in batch:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(batch)
+    
+    return batches
+
+def _run_test(test_name, test_func):
+    """Run a single test with its banner into a private buffer, returns (success, output)"""
+    out = io.StringIO()
+    print(f"\n{'='*50}", file=out)
+    print(f"Running {test_name} Test", file=out)
+    print('='*50, file=out)
+    
+    try:
+        success = test_func(out)
+    except Exception as e:
+        print(f"✗ {test_name} test crashed: {e}", file=out)
+        success = False
+    
+    return success, out.getvalue()
+
+# A test, the names of the tests that must run before it, and those of them that must
+# have passed, otherwise the test is skipped
+Node = namedtuple('Node', ['func', 'deps', 'requires'], defaults=((),))
+
+TESTS = {
+    "Dependencies": Node(test_dependencies, deps=()),
+    "Module Imports": Node(test_imports, deps=()),
+    "Visual Generator": Node(test_visual_generator, deps=("Module Imports",)),
+    "Music Generator": Node(test_music_generator, deps=("Module Imports",)),
+    # Importing main pulls in every generator, pointless to retry when their imports already failed
+    "Main Integration": Node(test_integration, deps=("Module Imports",), requires=("Module Imports",))
+}
+
+# Execution layers are resolved once at import, main() only iterates them
+BATCHES = _execution_batches(TESTS)
+
 def main():
     """Run all tests"""
     print("=== Visual and Music Generator Integration Test ===\n")
     
-    tests = [
-        ("Dependencies", test_dependencies),
-        ("Module Imports", test_imports),
-        ("Visual Generator", test_visual_generator),
-        ("Music Generator", test_music_generator),
-        ("Main Integration", test_integration)
-    ]
-    
-    results = []
+    results = {}
     
-    for test_name, test_func in tests:
-        print(f"\n{'='*50}")
-        print(f"Running {test_name} Test")
-        print('='*50)
+    for batch in BATCHES:
+        passed_so_far = {name for name, success in results.items() if success}
+        runnable = [name for name in batch if passed_so_far.issuperset(TESTS[name].requires)]
         
-        try:
-            success = test_func()
-            results.append((test_name, success))
-        except Exception as e:
-            print(f"✗ {test_name} test crashed: {e}")
-            results.append((test_name, False))
+        if len(runnable) <= 1:
+            outcomes = [_run_test(name, TESTS[name].func) for name in runnable]
+        else:
+            # Independent tests run concurrently, their output is written afterwards in declaration order
+            with ThreadPoolExecutor(max_workers=len(runnable)) as executor:
+                outcomes = list(executor.map(lambda name: _run_test(name, TESTS[name].func), runnable))
+        outcomes = dict(zip(runnable, outcomes))
+        
+        for test_name in batch:
+            if test_name in outcomes:
+                success, output = outcomes[test_name]
+                sys.stdout.write(output)
+            else:
+                success = None
+                print(f"\n⚠ Skipping {test_name} Test, requires: {', '.join(TESTS[test_name].requires)}")
+            results[test_name] = success
     
     # Summary
     print(f"\n{'='*50}")
     print("TEST SUMMARY")
     print('='*50)
     
-    passed = 0
+    passed = sum(1 for success in results.values() if success)
     total = len(results)
     
-    for test_name, success in results:
-        status = "PASS" if success else "FAIL"
+    for test_name, success in results.items():
+        status = "SKIP" if success is None else "PASS" if success else "FAIL"
         print(f"{test_name:20} {status}")
-        if success:
-            passed += 1
     
     print(f"\nResults: {passed}/{total} tests passed")
     
@@ -211,19 +343,19 @@ def main():
     print("RECOMMENDATIONS")
     print('='*50)
     
-    if not all(r[1] for r in results[:2]):  # Dependencies and imports
+    if not (results['Dependencies'] and results['Module Imports']):
         print("• Install missing dependencies: pip install -r requirements.txt")
         print("• Check Python environment and virtual environment")
     
-    if not results[2][1]:  # Visual generator
+    if not results['Visual Generator']:
         print("• Visual generator needs Stable Diffusion setup")
         print("• Install: pip install diffusers transformers accelerate")
     
-    if not results[3][1]:  # Music generator
+    if not results['Music Generator']:
         print("• Music generator needs music21 and audiocraft")
         print("• Install: pip install music21 audiocraft pydub")
     
-    if not results[4][1]:  # Main integration
+    if results['Main Integration'] is False:
         print("• Main application integration needs configuration")
         print("• Check config/config.json file exists")
     